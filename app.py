@@ -1,6 +1,5 @@
 import json
 import time
-from collections import deque
 
 import numpy as np
 import plotly.graph_objects as go
@@ -20,11 +19,15 @@ st.markdown(
 # -------------------------------
 # 🗄️ STATE
 # -------------------------------
+MAX_POINTS = 1000
+
 if "is_running" not in st.session_state:
     st.session_state.is_running = False
 
 if "positions" not in st.session_state:
-    st.session_state.positions = deque(maxlen=1000)
+    # Positions (x, y) pré-allouées ; seules les pos_len premières lignes sont valides
+    st.session_state.positions = np.zeros((MAX_POINTS, 2), np.float32)
+    st.session_state.pos_len = 0
 
 if "velocity" not in st.session_state:
     st.session_state.velocity = [0.0, 0.0]
@@ -47,7 +50,7 @@ if col1.button("▶️ Start"):
 if col2.button("⏸️ Stop"):
     st.session_state.is_running = False
 if col3.button("🔄 Reset"):
-    st.session_state.positions.clear()
+    st.session_state.pos_len = 0
     st.session_state.velocity = [0.0, 0.0]
     st.session_state.accel_data = [0.0, 0.0, 0.0]
     st.session_state.gyro_data = [0.0, 0.0, 0.0]
@@ -110,8 +113,36 @@ html(
 
   btn.addEventListener('click', askPermission, {passive:true});
 
-  // Écoute des capteurs -> met à jour ?sensor=... en continu
+  // Écoute des capteurs -> met à jour ?sensor=... avec le dernier échantillon
+  // (au plus une écriture d'URL par frame, limitée à ~20 Hz)
+  const SENSOR_PERIOD_MS = 50;
+  let latest = null;
+  let pending = false;
+  let lastWrite = 0;
+
+  function flushSensor(now){
+    if (latest === null) {
+      pending = false;
+      return;
+    }
+    if (now - lastWrite < SENSOR_PERIOD_MS) {
+      requestAnimationFrame(flushSensor);
+      return;
+    }
+    pending = false;
+    lastWrite = now;
+    const q = new URLSearchParams(window.location.search);
+    q.set('sensor', JSON.stringify(latest));
+    history.replaceState(null, '', window.location.pathname + '?' + q.toString());
+  }
+
+  // Onglet masqué : on ignore les événements et on jette l'échantillon en attente
+  document.addEventListener('visibilitychange', () => {
+    if (document.hidden) latest = null;
+  });
+
   window.addEventListener('devicemotion', (e) => {
+    if (document.hidden) return;
     const acc = (e.acceleration) || (e.accelerationIncludingGravity) || {};
     const rot = e.rotationRate || {};
     const payload = {
@@ -126,9 +157,11 @@ html(
         gamma: (typeof rot.gamma === 'number') ? rot.gamma : 0
       }
     };
-    const q = new URLSearchParams(window.location.search);
-    q.set('sensor', JSON.stringify(payload));
-    history.replaceState(null, '', window.location.pathname + '?' + q.toString());
+    latest = payload;
+    if (!pending) {
+      pending = true;
+      requestAnimationFrame(flushSensor);
+    }
   }, true);
 })();
 </script>
@@ -142,13 +175,14 @@ st.markdown("#### Tracé du mouvement")
 placeholder = st.empty()
 
 # Placeholder d'affichage
-if st.session_state.positions:
-    x, y = zip(*st.session_state.positions)
+pts = st.session_state.positions[:st.session_state.pos_len]
+if len(pts):
+    x, y = pts[:, 0], pts[:, 1]
 else:
     x, y = [0], [0]
 
 fig = go.Figure()
-fig.add_trace(go.Scatter(x=x, y=y, mode="lines+markers"))
+fig.add_trace(go.Scattergl(x=x, y=y, mode="lines+markers"))
 fig.update_layout(
     xaxis=dict(range=[-10, 10], title="X"),
     yaxis=dict(range=[-10, 10], title="Y"),
@@ -156,4 +190,4 @@ fig.update_layout(
     height=500,
     template="simple_white"
 )
-placeholder.plotly_chart(fig)
+placeholder.plotly_chart(fig, key="traj")